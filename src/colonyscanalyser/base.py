@@ -49,6 +49,7 @@ class IdentifiedCollection:
     """
     An collection of Identified objects with generic methods for modifying the collection
     """
+    __slots__ = ("__items",)
     T = TypeVar("T", bound = Identified)
 
     def __init__(self, items: Collection = None):
@@ -1,4 +1,5 @@
 ﻿from typing import Union, Dict, List, Tuple
+from bisect import insort
 from datetime import timedelta
 from dataclasses import dataclass
 from collections.abc import Collection
@@ -20,6 +21,9 @@ class Colony(Identified, Named, GrowthCurve):
         """
         Colony growth parameters at timed intervals
         """
+        # Many Timepoints are created for each Colony, slots reduce the memory used by each instance
+        __slots__ = ("timestamp", "area", "center", "diameter", "perimeter", "color_average")
+
         timestamp: timedelta
         area: int
         center: tuple
@@ -79,15 +83,17 @@ class Colony(Identified, Named, GrowthCurve):
 
     @property
     def center(self) -> Union[Tuple[float, float], Tuple[float, float, float]]:
-        centers = [x.center for x in self.timepoints]
+        timepoints = self.timepoints
+        centers = [x.center for x in timepoints]
 
-        return tuple(sum(x) / len(self.timepoints) for x in zip(*centers))
+        return tuple(sum(x) / len(timepoints) for x in zip(*centers))
 
     @property
     def color(self) -> Tuple[float, float, float]:
-        color_averages = [timepoint.color_average for timepoint in self.timepoints]
+        timepoints = self.timepoints
+        color_averages = [timepoint.color_average for timepoint in timepoints]
 
-        return tuple(sum(x) / len(self.timepoints) for x in zip(*color_averages))
+        return tuple(sum(x) / len(timepoints) for x in zip(*color_averages))
 
     @property
     def color_name(self) -> str:
@@ -96,26 +102,27 @@ class Colony(Identified, Named, GrowthCurve):
     @property
     def timepoints(self):
         if len(self.__timepoints) > 0:
-            return sorted(self.__timepoints)
+            # Timepoints are stored in order, so only a copy is needed
+            return self.__timepoints.copy()
         else:
             raise ValueError("No time points are stored for this colony")
 
     @timepoints.setter
     def timepoints(self, val: Collection):
         if isinstance(val, dict):
-            self.__timepoints = list(val.values())
+            self.__timepoints = sorted(val.values())
         elif isinstance(val, Collection) and not isinstance(val, str):
-            self.__timepoints = [timepoint for timepoint in val]
+            self.__timepoints = sorted(val)
         else:
             raise ValueError("Timepoints must be supplied as a Dict or other Collection")
 
     @property
     def timepoint_first(self) -> "Timepoint":
-        return min(self.timepoints)
+        return self.timepoints[0]
 
     @property
     def timepoint_last(self) -> "Timepoint":
-        return max(self.timepoints)
+        return self.timepoints[-1]
 
     @property
     def time_of_appearance(self) -> timedelta:
@@ -138,8 +145,9 @@ class Colony(Identified, Named, GrowthCurve):
 
         :param timepoint: a Timepoint object
         """
-        if timepoint not in self.timepoints:
-            self.__timepoints.append(timepoint)
+        if timepoint not in self.__timepoints:
+            # Keep the timepoints in order
+            insort(self.__timepoints, timepoint)
         else:
             raise ValueError(f"This time point at {timepoint.timestamp}  already exists")
 
@@ -178,7 +186,7 @@ def timepoints_from_image(
     :returns: a list of colony objects
     """
     from .imaging import cut_image_circle
-    from skimage.measure import regionprops
+    from skimage.measure import regionprops_table
 
     colonies = list()
 
@@ -186,13 +194,26 @@ def timepoints_from_image(
         if image.shape[:2] != image_segmented.shape[:2]:
             raise ValueError("The image and its segmented image must be the same size")
 
-    for rp in regionprops(image_segmented):
+    # Measure the properties of all objects in a single batch
+    properties = regionprops_table(
+        image_segmented,
+        properties = ("area", "centroid", "equivalent_diameter", "perimeter", "slice")
+    )
+
+    for area, center_row, center_col, diameter, perimeter, object_slice in zip(
+        properties["area"],
+        properties["centroid-0"],
+        properties["centroid-1"],
+        properties["equivalent_diameter"],
+        properties["perimeter"],
+        properties["slice"]
+    ):
         color_average = (0, 0, 0)
         if image is not None:
             # Select an area of the colony slightly smaller than its full radius
             # This avoids the edge halo of the image which may contain background pixels
-            radius = (rp.equivalent_diameter / 2) - ((rp.equivalent_diameter / 2) * 0.10)
-            image_circle = cut_image_circle(image[rp.slice], radius - 1)
+            radius = (diameter / 2) - ((diameter / 2) * 0.10)
+            image_circle = cut_image_circle(image[object_slice], radius - 1)
             # Filter out fringe alpha values and empty pixels
             limit = 0
             if image_circle.shape[2] > 3:
@@ -204,10 +225,10 @@ def timepoints_from_image(
         # Create a new time point object to store colony data
         timepoint_data = Colony.Timepoint(
             timestamp = timestamp,
-            area = rp.area,
-            center = rp.centroid,
-            diameter = rp.equivalent_diameter,
-            perimeter = rp.perimeter,
+            area = area,
+            center = (center_row, center_col),
+            diameter = diameter,
+            perimeter = perimeter,
             color_average = color_average
         )
 
@@ -268,16 +289,23 @@ def group_timepoints_by_center(
         from scipy.spatial.distance import euclidean as dist
 
     center_groups = list()
-    timepoints = timepoints.copy()
 
     while len(timepoints) > 0:
+        center = timepoints[0].center
         centers = list()
+        remaining = list()
 
         # Compare current center with remaining centers in the list
-        for j, timepoint_compare in reversed(list(enumerate(timepoints))):
-            if dist(timepoints[0].center, timepoint_compare.center) <= max_distance:
-                # Remove the Timepoint to a group if within distance limit
-                centers.append(timepoints.pop(j))
+        # Building new lists in a single pass avoids removing items from the middle of a list
+        for timepoint_compare in reversed(timepoints):
+            if dist(center, timepoint_compare.center) <= max_distance:
+                # Add the Timepoint to a group if within distance limit
+                centers.append(timepoint_compare)
+            else:
+                remaining.append(timepoint_compare)
+
+        remaining.reverse()
+        timepoints = remaining
 
         if centers:
             center_groups.append(centers)
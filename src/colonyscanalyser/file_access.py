@@ -1,4 +1,5 @@
-﻿from typing import Optional, Union, List
+﻿from typing import Optional, Union, List, Tuple
+from functools import lru_cache
 from enum import Enum
 from collections.abc import Collection
 from pathlib import Path
@@ -30,6 +31,20 @@ def file_safe_name(file_name: List[str], separator: str = "_") -> str:
     :param separator: a character to place in between the items of file_name
     :returns: a new filename string
     """
+    return _file_safe_name(tuple(file_name), separator)
+
+
+@lru_cache(maxsize = 512)
+def _file_safe_name(file_name: Tuple[str, ...], separator: str) -> str:
+    """
+    Cached implementation of file_safe_name
+
+    The same file names are generated for each plate every time data is saved
+
+    :param file_name: a tuple of strings that make up the complete filename
+    :param separator: a character to place in between the items of file_name
+    :returns: a new filename string
+    """
     safe_names = [val.replace(" ", separator) for val in file_name]
 
     return separator.join(filter(None, safe_names))
@@ -138,7 +153,8 @@ def file_compression(file_path: Path, compression: CompressionMethod, access_mod
         return bz2.BZ2File(file_path.with_suffix(CompressionMethod.BZ2.value), mode = access_mode)
     elif compression == CompressionMethod.GZIP:
         import gzip
-        return gzip.GzipFile(file_path.with_suffix(CompressionMethod.GZIP.value), mode = access_mode)
+        # Favour speed over file size, the compression level is ignored when reading
+        return gzip.GzipFile(file_path.with_suffix(CompressionMethod.GZIP.value), mode = access_mode, compresslevel = 1)
     elif compression == CompressionMethod.LZMA:
         import lzma
         return lzma.LZMAFile(file_path.with_suffix(CompressionMethod.LZMA.value), mode = access_mode)
@@ -221,7 +237,8 @@ def save_to_csv(data: Collection, headers: List[str], save_path: Union[Path, str
     save_path = save_path.with_suffix(".csv")
 
     try:
-        with open(save_path, 'w') as outfile:
+        # Use a large write buffer so that rows are not written to disk in many small chunks
+        with open(save_path, 'w', buffering = 1024 * 1024) as outfile:
             if isinstance(data, dict):
                 # Dictionary values are assigned by key to column headers
                 writer = csv.DictWriter(
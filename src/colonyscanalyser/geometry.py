@@ -71,7 +71,7 @@ class Circle(Shape):
 
     @property
     def area(self) -> float:
-        return pi * self.radius * self.radius
+        return self.__area
 
     @property
     def circumference(self) -> float:
@@ -87,6 +87,8 @@ class Circle(Shape):
             raise ValueError("The diameter must be a number greater than zero")
 
         self.__diameter = val
+        # The area is only recalculated when the diameter changes
+        self.__area = pi * self.radius * self.radius
 
     @property
     def height(self) -> float:
@@ -1,4 +1,6 @@
 from typing import Optional, List
+from collections.abc import Collection
+from operator import attrgetter
 from pathlib import Path
 from datetime import datetime, timedelta
 from re import search
@@ -57,7 +59,8 @@ class ImageFile(Unique, TimeStampElapsed):
 
     @property
     def image(self) -> ndarray:
-        if self.cache_image and self.__image is not None:
+        # Use the stored image if it has been cached or loaded by the context manager
+        if self.__image is not None:
             return self.__image.copy()
         else:
             return ImageFile.__load_image(self.file_path)
@@ -105,12 +108,13 @@ class ImageFile(Unique, TimeStampElapsed):
 
         result = search(pattern, search_string)
         if result:
+            groups = result.groupdict()
             return datetime(
-                year = int(result.groupdict()["year"]),
-                month = int(result.groupdict()["month"]),
-                day = int(result.groupdict()["day"]),
-                hour = int(result.groupdict()["hour"]),
-                minute = int(result.groupdict()["minute"])
+                year = int(groups["year"]),
+                month = int(groups["month"]),
+                day = int(groups["day"]),
+                hour = int(groups["hour"]),
+                minute = int(groups["minute"])
             )
         else:
             return None
@@ -123,10 +127,17 @@ class ImageFile(Unique, TimeStampElapsed):
 class ImageFileCollection(IdentifiedCollection):
     """
     Holds a collection of ImageFiles
+
+    ImageFiles are stored in timestamp order when they are added, instead of being sorted on every access
     """
     @IdentifiedCollection.items.getter
     def items(self) -> List[ImageFile]:
-        return sorted(self._IdentifiedCollection__items, key = lambda item: item.timestamp)
+        return self._IdentifiedCollection__items.copy()
+
+    @items.setter
+    def items(self, val: Collection):
+        IdentifiedCollection.items.fset(self, val)
+        self._IdentifiedCollection__items.sort(key = attrgetter("timestamp"))
 
     @property
     def file_paths(self) -> List[datetime]:
@@ -187,3 +198,16 @@ class ImageFileCollection(IdentifiedCollection):
         self.append(image_file)
 
         return image_file
+
+    def append(self, item: ImageFile):
+        """
+        Append an ImageFile to the collection, in timestamp order
+
+        :param item: the ImageFile to append to the collection
+        """
+        super(ImageFileCollection, self).append(item)
+
+        # Images are usually added in order, so the collection rarely needs sorting
+        items = self._IdentifiedCollection__items
+        if len(items) > 1 and items[-2].timestamp > item.timestamp:
+            items.sort(key = attrgetter("timestamp"))
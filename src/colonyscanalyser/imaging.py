@@ -1,4 +1,5 @@
 from typing import Optional, Union, Tuple, List
+from functools import lru_cache
 from numpy import ndarray
 
 
@@ -77,30 +78,54 @@ def crop_image(
     """
     import operator
 
-    img = image.copy()
-
     if any(x < 0 for x in crop_shape) or any(not isinstance(x, int) for x in crop_shape) or len(image.shape) < len(crop_shape):
         raise ValueError(
             f"The crop shape ({crop_shape}) must be positive integers and the same dimensions as the image to crop"
         )
-    if crop_shape > img.shape:
+    if crop_shape > image.shape:
         raise ValueError(f"The crop shape ({crop_shape}) cannot be larger than the image ({image.shape}) to crop")
 
     if center is None:
         # Use the center of the image
-        start = tuple(map(lambda a, da: a // 2 - da // 2, img.shape, crop_shape))
+        start = tuple(map(lambda a, da: a // 2 - da // 2, image.shape, crop_shape))
     else:
         # Use a custom center point
         start = tuple(map(lambda a, da: a - da // 2, center, crop_shape))
 
     end = tuple(map(operator.add, start, crop_shape))
 
-    if any(x < 0 for x in start) or end > img.shape:
+    if any(x < 0 for x in start) or end > image.shape:
         raise ValueError("The crop area cannot be outside the original image")
 
     slices = tuple(map(slice, start, end))
 
-    return img[slices]
+    # Only copy the cropped area, rather than the whole image
+    return image[slices].copy()
+
+
+def _circle_mask(shape: Tuple[int, int], radius: float) -> ndarray:
+    """
+    Get a boolean mask of the circular area around the center of an image
+
+    :param shape: a row, column tuple image size
+    :param radius: the circle radius
+    :returns: a read-only boolean array, True inside the circle
+    """
+    from numpy import sqrt, ogrid
+
+    cy, cx = map(lambda x: x // 2, shape)
+
+    # Calculate distances from center
+    rows, cols = ogrid[:shape[0], :shape[1]]
+    mask = sqrt((cols - cx) ** 2 + (rows - cy) ** 2) <= radius
+    mask.flags.writeable = False
+
+    return mask
+
+
+# Kept separate from per-object calls, so that the masks for areas cut
+# from every image in a series are not evicted between images
+_circle_mask_cached = lru_cache(maxsize = 128)(_circle_mask)
 
 
 def cut_image_circle(
@@ -108,7 +133,8 @@ def cut_image_circle(
     center: Optional[Tuple[float, float]] = None,
     radius: Optional[float] = None,
     inverse: bool = False,
-    background_color = 0
+    background_color = 0,
+    cache_mask: bool = False
 ) -> ndarray:
     """
     Get the circular area of an image
@@ -120,35 +146,31 @@ def cut_image_circle(
     :param radius: an integer length
     :param inverse: if True, returns the image area outside the circle
     :param background_color: the color to replace the empty parts of the image
+    :param cache_mask: if True, reuse the circle mask for areas of the same size cut from every image in a series
     :returns: an image as a numpy array
     """
-    from numpy import sqrt, arange, vstack
-
-    img = image.copy()
-
     # Either use the entire image or crop to a radius
     if radius is None:
         radius = image.shape[0] // 2
+        img = image.copy()
     else:
-        if any(radius * 2 > x for x in img.shape[:2]):
+        if any(radius * 2 > x for x in image.shape[:2]):
             raise ValueError("The circle radius cannot be larger than the supplied image")
         # Crop the image around the center point
         crop_area = (int(radius) * 2) + 1
-        img = crop_image(img, (crop_area, crop_area), center)
-
-    cy, cx = map(lambda x: x // 2, img.shape[:2])
+        img = crop_image(image, (crop_area, crop_area), center)
 
-    # Calculate distances from center
-    dist_x = vstack([(arange(img.shape[1]) - cx)] * (img.shape[0]))
-    dist_y = vstack([(arange(img.shape[0]) - cy)] * (img.shape[1])).T
-    dist = sqrt(dist_x ** 2 + dist_y ** 2)
+    if cache_mask:
+        mask = _circle_mask_cached(img.shape[:2], radius)
+    else:
+        mask = _circle_mask(img.shape[:2], radius)
 
     if inverse:
         # Remove image information in area inside boundary
-        img[dist <= radius] = background_color
+        img[mask] = background_color
     else:
         # Remove image information in area outside boundary
-        img[dist > radius] = background_color
+        img[~mask] = background_color
 
     return img
 
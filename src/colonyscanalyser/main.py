@@ -8,9 +8,10 @@ from distutils.util import strtobool
 from collections import defaultdict
 from multiprocessing import Pool, cpu_count
 from functools import partial
+from hashlib import blake2b
 
 # Third party modules
-from numpy import ndarray, diff
+from numpy import ndarray, diff, ones, ascontiguousarray
 
 # Local modules
 from colonyscanalyser import (
@@ -23,6 +24,9 @@ from .image_file import ImageFile, ImageFileCollection
 from .plate import Plate, PlateCollection
 from .colony import Colony, timepoints_from_image, colonies_from_timepoints, timepoints_from_image
 
+# Arguments shared by all tasks in a worker process, set by worker_initializer
+_worker_kwargs = dict()
+
 
 def segment_image(
     plate_image: ndarray,
@@ -35,49 +39,74 @@ def segment_image(
 
     :param plate_image: an image containing colonies
     :param plate_mask: a boolean image mask to remove from the original image
-    :param plate_noise_mask: a black and white image as a numpy array
+    :param plate_noise_mask: a boolean image mask of static objects, see noise_mask_from_image
     :param area_min: the minimum area for a colony, in pixels
     :returns: a segmented and labelled image as a numpy array
     """
-    from numpy import unique, isin
-    from skimage.measure import regionprops, label
+    from skimage.measure import label
     from skimage.morphology import remove_small_objects, binary_erosion
-    from skimage.segmentation import clear_border
 
     plate_image = imaging.remove_background_mask(plate_image, smoothing = 0.5)
 
     if plate_mask is not None:
         # Remove mask from image
         plate_image = plate_image & plate_mask
-        # Remove objects touching the mask border
-        plate_image = clear_border(plate_image, bgval = 0, mask = binary_erosion(plate_mask))
+        # Objects touching the mask border will be removed
+        borders = ~binary_erosion(plate_mask)
     else:
-        # Remove objects touching the image border
-        plate_image = clear_border(plate_image, buffer_size = 2, bgval = 0)
+        # Objects touching the image border will be removed, with a buffer of 2 pixels
+        borders = ones(plate_image.shape, dtype = bool)
+        borders[3:-3, 3:-3] = False
 
     plate_image = label(plate_image, connectivity = 2)
 
+    # Remove objects touching the border in a single pass with a lookup table of labels to keep
+    # This avoids labelling the image twice, as clear_border would
+    keep = ones(plate_image.max() + 1, dtype = bool)
+    keep[plate_image[borders]] = False
+    plate_image *= keep[plate_image]
+
     # Remove background noise
-    if len(unique(plate_image)) > 1:
+    # Comparing the extremes avoids sorting the whole image to find its unique values
+    if plate_image.min() < plate_image.max():
         plate_image = remove_small_objects(plate_image, min_size = area_min)
 
     # Remove colonies that have grown on top of image artefacts or static objects
     if plate_noise_mask is not None:
-        plate_noise_image = imaging.remove_background_mask(plate_noise_mask, smoothing = 0.5)
-        if len(unique(plate_noise_mask)) > 1:
-            noise_mask = remove_small_objects(plate_noise_image, min_size = area_min)
         # Remove all objects where there is an existing static object
-        exclusion = unique(plate_image[noise_mask])
-        exclusion_mask = isin(plate_image, exclusion[exclusion > 0])
-        plate_image[exclusion_mask] = 0
+        # A lookup table of labels to keep allows all objects to be removed in a single pass
+        keep = ones(plate_image.max() + 1, dtype = bool)
+        keep[plate_image[plate_noise_mask]] = False
+        plate_image *= keep[plate_image]
 
     return plate_image
 
 
+def noise_mask_from_image(plate_image: ndarray, area_min: float = 1) -> ndarray:
+    """
+    Locate image artefacts and static objects on a plate
+
+    The mask only depends on the plate image used, so it can be reused for every image of the same plate
+
+    :param plate_image: an image of a plate before any colonies have grown
+    :param area_min: the minimum area for a static object, in pixels
+    :returns: a boolean image mask of static objects
+    """
+    from skimage.morphology import remove_small_objects
+
+    noise_mask = imaging.remove_background_mask(plate_image, smoothing = 0.5)
+    # Only remove objects if the mask contains both objects and background
+    if noise_mask.any() and not noise_mask.all():
+        noise_mask = remove_small_objects(noise_mask, min_size = area_min)
+
+    return noise_mask
+
+
 def image_file_to_timepoints(
     image_file: ndarray,
     plates: PlateCollection,
     plate_noise_masks: Dict[int, ndarray],
+    plate_masks: Dict[int, ndarray] = None,
     plot_path: Path = None
 ) -> Dict[int, List[Colony.Timepoint]]:
     """
@@ -87,7 +116,8 @@ def image_file_to_timepoints(
 
     :param image_file: an ImageFile object
     :param plates: a PlateCollection of Plate instances
-    :param plate_noise_masks: a dict of plate images to use as noise masks
+    :param plate_noise_masks: a dict of boolean noise masks, see noise_mask_from_image
+    :param plate_masks: a dict of boolean masks of the plate areas, calculated from each image if not supplied
     :param plot_path: a Path directory to save the segmented image plot
     :returns: a Dict of lists, each containing Timepoint objects
     """
@@ -99,20 +129,50 @@ def image_file_to_timepoints(
     # Split image into individual plates
     plate_images = plates.slice_plate_image(image_file.image)
 
-    for plate_id, plate_image in plate_images.items():
+    for plate_id in list(plate_images.keys()):
+        # Release each plate image once it has been processed
+        plate_image = plate_images.pop(plate_id)
         plate_image_gray = rgb2gray(plate_image)
+        if plate_masks is not None:
+            plate_mask = plate_masks[plate_id]
+        else:
+            plate_mask = plate_image_gray > 0
         # Segment each image
-        plate_images[plate_id] = segment_image(plate_image_gray, plate_mask = plate_image_gray > 0, plate_noise_mask = plate_noise_masks[plate_id], area_min = 1.5)
+        plate_image_segmented = segment_image(plate_image_gray, plate_mask = plate_mask, plate_noise_mask = plate_noise_masks[plate_id], area_min = 1.5)
         # Create Timepoint objects for each plate
-        plate_timepoints[plate_id].extend(timepoints_from_image(plate_images[plate_id], image_file.timestamp_elapsed, image = plate_image))
+        plate_timepoints[plate_id].extend(timepoints_from_image(plate_image_segmented, image_file.timestamp_elapsed, image = plate_image))
         # Save segmented image plot, if required
         if plot_path is not None:
             save_path = file_access.create_subdirectory(plot_path, f"plate{plate_id}")
-            plots.plot_plate_segmented(plate_image_gray, plate_images[plate_id], image_file.timestamp, save_path)
+            plots.plot_plate_segmented(plate_image_gray, plate_image_segmented, image_file.timestamp, save_path)
 
     return plate_timepoints
 
 
+def worker_initializer(kwargs: Dict):
+    """
+    Store read-only arguments in a worker process
+
+    Allows large arguments to be sent to each process once, instead of with every task
+
+    :param kwargs: a dict of keyword arguments for image_file_to_timepoints
+    """
+    global _worker_kwargs
+    _worker_kwargs = kwargs
+
+
+def image_file_to_timepoints_worker(image_file: ImageFile) -> Dict[int, List[Colony.Timepoint]]:
+    """
+    Get Timepoint object data from a plate image, in a worker process
+
+    Uses the arguments stored by worker_initializer
+
+    :param image_file: an ImageFile object
+    :returns: a Dict of lists, each containing Timepoint objects
+    """
+    return image_file_to_timepoints(image_file, **_worker_kwargs)
+
+
 # flake8: noqa: C901
 def main():
     parser = argparse.ArgumentParser(
@@ -177,7 +237,7 @@ def main():
             print("Attempting to load cached data")
         plates = file_access.load_file(
             BASE_PATH.joinpath("data", segmented_image_data_filename),
-            file_access.CompressionMethod.LZMA,
+            file_access.CompressionMethod.GZIP,
             pickle = True
         )
         # Check that segmented image data has been loaded for all plates
@@ -224,7 +284,6 @@ def main():
         image_files.timestamps_initial = image_files.timestamps[0]
 
         # Process images to Timepoint data objects
-        plate_images_mask = None
         plate_timepoints = defaultdict(list)
 
         if VERBOSE >= 1:
@@ -232,20 +291,58 @@ def main():
 
         # Load the first image to get plate coordinates and mask
         with image_files.items[0] as image_file:
+            image_gray = image_file.image_gray
+
             # Only find centers using first image. Assume plates do not move
             if plates is None:
-                if VERBOSE >= 2:
-                    print(f"Locating plate centres in image: {image_file.file_path}")
-
-                # Create new Plate instances to store the information
-                plates = PlateCollection.from_image(
-                    shape = PLATE_LATTICE,
-                    image = image_file.image_gray,
-                    diameter = PLATE_SIZE,
-                    search_radius = PLATE_SIZE // 20,
-                    edge_cut = PLATE_EDGE_CUT,
-                    labels = PLATE_LABELS
-                )
+                # Locating plates is slow, so allow reuse of the plates previously found with the same image and settings
+                # The image buffer is hashed directly, avoiding a copy of the image
+                plates_cache_key = blake2b(ascontiguousarray(image_gray), digest_size = 16)
+                plates_cache_key.update(str((image_gray.shape, image_gray.dtype.str)).encode())
+                plates_cache_key.update(str((PLATE_LATTICE, PLATE_SIZE, PLATE_EDGE_CUT)).encode())
+                plates_cache_key = plates_cache_key.hexdigest()
+                # A single cache file is kept, storing the key alongside the plates
+                plates_cache_path = file_access.create_subdirectory(BASE_PATH, "data").joinpath("cached_plates")
+                if USE_CACHED:
+                    try:
+                        cached_key, cached_plates = file_access.load_file(
+                            plates_cache_path,
+                            file_access.CompressionMethod.GZIP,
+                            pickle = True
+                        )
+                        if cached_key == plates_cache_key:
+                            plates = cached_plates
+                    except Exception:
+                        # A missing, incomplete or outdated cache file is treated as a cache miss
+                        plates = None
+
+                if isinstance(plates, PlateCollection):
+                    if VERBOSE >= 2:
+                        print(f"Loaded cached plate locations for image: {image_file.file_path}")
+
+                    # Labels are not part of the cached settings
+                    for plate in plates.items:
+                        plate.name = PLATE_LABELS.get(plate.id, "")
+                else:
+                    if VERBOSE >= 2:
+                        print(f"Locating plate centres in image: {image_file.file_path}")
+
+                    # Create new Plate instances to store the information
+                    plates = PlateCollection.from_image(
+                        shape = PLATE_LATTICE,
+                        image = image_gray,
+                        diameter = PLATE_SIZE,
+                        search_radius = PLATE_SIZE // 20,
+                        edge_cut = PLATE_EDGE_CUT,
+                        labels = PLATE_LABELS
+                    )
+
+                    if plates.count > 0:
+                        file_access.save_file(
+                            plates_cache_path,
+                            (plates_cache_key, plates),
+                            file_access.CompressionMethod.GZIP
+                        )
 
                 if not plates.count > 0:
                     print(f"Unable to locate plates in image: {image_file.file_path}")
@@ -257,74 +354,87 @@ def main():
                         print(f"Plate {plate.id} center: {plate.center}")
 
             # Use the first plate image as a noise mask
-            plate_noise_masks = plates.slice_plate_image(image_file.image_gray)
+            # Plates do not move, so the noise masks and plate masks are the same for every image
+            plate_noise_masks = {
+                plate_id: noise_mask_from_image(plate_image, area_min = 1.5)
+                for plate_id, plate_image in plates.slice_plate_image(image_gray).items()
+            }
+            plate_masks = plates.slice_plate_image(ones(image_gray.shape, dtype = bool))
+            image_gray = None
 
         if VERBOSE >= 1:
             print("Processing colony data from all images")
 
-        # Thin wrapper to display a progress bar
-        def progress_update(result, progress):
-            utilities.progress_bar(progress, message = "Processing images")
-
-        processes = list()
-        with Pool(processes = POOL_MAX) as pool:
-            for i, image_file in enumerate(image_files.items):
-                # Allow args to be passed to callback function
-                callback_function = partial(progress_update, progress = ((i + 1) / image_files.count) * 100)
-
-                # Create processes
-                processes.append(pool.apply_async(
-                    image_file_to_timepoints,
-                    args = (image_file, plates, plate_noise_masks),
-                    kwds = {"plot_path" : None},
-                    callback = callback_function
-                ))
-
-            # Consolidate the results to a single dict
-            for process in processes:
-                result = process.get()
+        # The plates and masks are passed to each process once, instead of with every image
+        worker_kwargs = {
+            "plates": plates,
+            "plate_noise_masks": plate_noise_masks,
+            "plate_masks": plate_masks,
+            "plot_path": None
+        }
+        # Divide up image files between processes in small batches
+        chunk_size = max(1, image_files.count // (POOL_MAX * 4))
+        with Pool(processes = POOL_MAX, initializer = worker_initializer, initargs = (worker_kwargs, )) as pool:
+            # Results are returned in image order as soon as they are available
+            # Consolidate the results to a single dict, without holding every result in memory
+            results = pool.imap(image_file_to_timepoints_worker, image_files.items, chunksize = chunk_size)
+            for i, result in enumerate(results, start = 1):
                 for plate_id, timepoints in result.items():
                     plate_timepoints[plate_id].extend(timepoints)
+                utilities.progress_bar((i / image_files.count) * 100, message = "Processing images")
 
         # Clear objects to free up memory
-        processes = None
-        plate_images = None
+        worker_kwargs = None
         plate_noise_masks = None
-        img = None
+        plate_masks = None
 
         if VERBOSE >= 1:
             print("Calculating colony properties")
 
+        # Skip plates where no objects are found
+        plate_ids = [plate_id for plate_id, timepoints in plate_timepoints.items() if len(timepoints) > 0]
+
+        # Variation in the image capture intervals, used to filter out objects with gaps in their data
+        # Only calculated once as the image timestamps are the same for all plates
+        timestamp_diff_std = diff(image_files.timestamps_elapsed_seconds[1:]).std()
+        timestamp_diff_std += 20
+
         # Group Timepoints by centres and create Colony objects
-        for plate_id, plate_timepoints in plate_timepoints.items():
-            # If no objects are found
-            if not len(plate_timepoints) > 0:
-                break
-
-            plate = plates.get_item(plate_id)
-            plate.items = colonies_from_timepoints(plate_timepoints, distance_tolerance = 2)
-            if VERBOSE >= 3:
-                print(f"{plate.count} objects located on plate {plate.id}, before filtering")
-
-            # Filter colonies to remove noise, background objects and merged colonies
-            timestamp_diff_std = diff(image_files.timestamps_elapsed_seconds[1:]).std()
-            timestamp_diff_std += 20
-            plate.items = list(filter(lambda colony:
-                # Remove objects that do not have sufficient data points
-                len(colony.timepoints) > 5 and
-                # No colonies should be visible at the start of the experiment
-                colony.time_of_appearance.total_seconds() > 0 and
-                # Remove objects with large gaps in the data
-                diff([t.timestamp.total_seconds() for t in colony.timepoints[1:]]).std() < timestamp_diff_std and
-                # Remove object that do not show growth, these are not colonies
-                colony.timepoint_last.area > 4 * colony.timepoint_first.area and
-                # Objects that appear with a large initial area are either merged colonies or noise
-                colony.timepoint_first.area < 10,
-                plate.items
-            ))
+        # Each plate is independent, so the plates can be processed in parallel
+        # Timepoints are released as each plate is sent for processing, and colonies are filtered
+        # as each plate is returned, so only the filtered colonies are held in memory
+        func = partial(colonies_from_timepoints, distance_tolerance = 2)
+        with Pool(processes = max(1, min(POOL_MAX, len(plate_ids)))) as pool:
+            plate_colonies = pool.imap(func, (plate_timepoints.pop(plate_id) for plate_id in plate_ids))
+
+            for plate_id, colonies in zip(plate_ids, plate_colonies):
+                plate = plates.get_item(plate_id)
+                plate.items = colonies
+                colonies = None
+                if VERBOSE >= 3:
+                    print(f"{plate.count} objects located on plate {plate.id}, before filtering")
+
+                # Filter colonies to remove noise, background objects and merged colonies
+                # The more costly checks are made last, so they are skipped for objects that have already failed
+                plate.items = [
+                    colony for colony in plate.items
+                    # Remove objects that do not have sufficient data points
+                    if len(colony.timepoints) > 5
+                    # Objects that appear with a large initial area are either merged colonies or noise
+                    and colony.timepoint_first.area < 10
+                    # No colonies should be visible at the start of the experiment
+                    and colony.time_of_appearance.total_seconds() > 0
+                    # Remove object that do not show growth, these are not colonies
+                    and colony.timepoint_last.area > 4 * colony.timepoint_first.area
+                    # Remove objects with large gaps in the data
+                    and diff([t.timestamp.total_seconds() for t in colony.timepoints[1:]]).std() < timestamp_diff_std
+                ]
+
+                if VERBOSE >= 1:
+                    print(f"{plate.count} colonies identified on plate {plate.id}")
 
-            if VERBOSE >= 1:
-                print(f"{plate.count} colonies identified on plate {plate.id}")
+        # Clear objects to free up memory
+        plate_timepoints = None
 
         if not any([plate.count for plate in plates.items]):
             if VERBOSE >= 1:
@@ -335,7 +445,7 @@ def main():
     # Store pickled data to allow quick re-use
     save_path = file_access.create_subdirectory(BASE_PATH, "data")
     save_path = save_path.joinpath(segmented_image_data_filename)
-    save_status = file_access.save_file(save_path, plates, file_access.CompressionMethod.LZMA)
+    save_status = file_access.save_file(save_path, plates, file_access.CompressionMethod.GZIP)
     if VERBOSE >= 1:
         if save_status:
             print(f"Cached data saved to {save_path}")
@@ -348,8 +458,6 @@ def main():
         
     save_path = BASE_PATH.joinpath("data")
     for plate in plates.items:
-        for colony in plate.items:
-            test = colony.__iter__()
         # Save data for all colonies on one plate
         plate.colonies_to_csv(save_path)
 
@@ -367,10 +475,11 @@ def main():
         if PLOTS >= 1:
             if VERBOSE >= 1:
                 print("Saving plots")
+            timestamps_elapsed = image_files.timestamps_elapsed
             # Summary plots for all plates
             plots.plot_growth_curve(plates.items, save_path)
-            plots.plot_appearance_frequency(plates.items, save_path, timestamps = image_files.timestamps_elapsed)
-            plots.plot_appearance_frequency(plates.items, save_path, timestamps = image_files.timestamps_elapsed, bar = True)
+            plots.plot_appearance_frequency(plates.items, save_path, timestamps = timestamps_elapsed)
+            plots.plot_appearance_frequency(plates.items, save_path, timestamps = timestamps_elapsed, bar = True)
             plots.plot_doubling_map(plates.items, save_path)
             plots.plot_colony_map(image_files.items[-1].image, plates.items, save_path)
 
@@ -380,8 +489,8 @@ def main():
                 save_path_plate = file_access.create_subdirectory(save_path, file_access.file_safe_name([f"plate{plate.id}", plate.name]))
                 # Plot colony growth curves, ID map and time of appearance for each plate
                 plots.plot_growth_curve([plate], save_path_plate)
-                plots.plot_appearance_frequency([plate], save_path_plate, timestamps = image_files.timestamps_elapsed)
-                plots.plot_appearance_frequency([plate], save_path_plate, timestamps = image_files.timestamps_elapsed, bar = True)
+                plots.plot_appearance_frequency([plate], save_path_plate, timestamps = timestamps_elapsed)
+                plots.plot_appearance_frequency([plate], save_path_plate, timestamps = timestamps_elapsed, bar = True)
 
         if PLOTS >= 4:
             # Plot individual plate images as an animation
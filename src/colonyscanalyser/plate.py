@@ -1,6 +1,8 @@
 from __future__ import annotations
 from typing import Union, Dict, List, Tuple
 from collections.abc import Collection
+from operator import attrgetter, mul
+from functools import reduce
 from datetime import timedelta
 from pathlib import Path, PurePath
 from statistics import median
@@ -8,7 +10,62 @@ from numpy import ndarray
 from .base import Identified, IdentifiedCollection, Named
 from .geometry import Circle
 from .file_access import save_to_csv, file_safe_name
+from .imaging import get_image_circles, cut_image_circle
 from .growth_curve import GrowthCurve
+from .utilities import dicts_merge
+
+
+# Default column headers for CSV output
+_COLONY_CSV_HEADERS = (
+    "Colony ID",
+    "Time of appearance (elapsed time)",
+    "Time of appearance (elapsed minutes)",
+    "Center point averaged (row, column)",
+    "Colour averaged name",
+    "Colour averaged (R,G,B)",
+    "Lag time (minutes)",
+    "Lag time standard deviation (minutes)",
+    "Growth rate (log2[Area] / minute)",
+    "Growth rate standard deviation (log2[Area] / minute)",
+    "Carrying capacity (log2[Area])",
+    "Carrying capacity standard deviation (log2[Area])",
+    "Doubling time (minutes)",
+    "Doubling time standard deviation(minutes)",
+    "First detection (elapsed minutes)",
+    "First area (pixels)",
+    "First diameter (pixels)",
+    "Final detection (elapsed minutes)",
+    "Final area (pixels)",
+    "Final diameter (pixels)"
+)
+
+_TIMEPOINT_CSV_HEADERS = (
+    "Colony ID",
+    "Elapsed time (minutes)",
+    "Area (pixels)",
+    "Center (row, column)",
+    "Diameter (pixels)",
+    "Perimeter (pixels)",
+    "Color average (R,G,B)"
+)
+
+_PLATE_CSV_HEADERS = (
+    "Plate ID",
+    "Plate label",
+    "Center (row, column)",
+    "Diameter (pixels)",
+    "Edge cut (pixels)",
+    "Colony count",
+    "Time of appearance (minutes)",
+    "Lag time (minutes)",
+    "Lag time standard deviation (minutes)",
+    "Growth rate (log2[Area] / minute)",
+    "Growth rate standard deviation (log2[Area] / minute)",
+    "Carrying capacity (log2[Area])",
+    "Carrying capacity standard deviation (log2[Area])",
+    "Doubling time (minutes)",
+    "Doubling time standard deviation (minutes)"
+)
 
 
 class Plate(GrowthCurve, Identified, IdentifiedCollection, Named, Circle):
@@ -42,7 +99,7 @@ class Plate(GrowthCurve, Identified, IdentifiedCollection, Named, Circle):
     def __iter__(self):
         appearance = [colony.time_of_appearance.total_seconds() // 60 for colony in self.items] or [0]
 
-        return iter([
+        return iter((
             self.id,
             self.name,
             self.center,
@@ -58,15 +115,7 @@ class Plate(GrowthCurve, Identified, IdentifiedCollection, Named, Circle):
             round(self.growth_curve.carrying_capacity_std, 4),
             self.growth_curve.doubling_time.total_seconds() // 60,
             self.growth_curve.doubling_time_std.total_seconds() // 60
-        ])
-
-    @property
-    def center(self) -> Union[Tuple[float, float], Tuple[float, float, float]]:
-        return self.__center
-
-    @center.setter
-    def center(self, val: Union[Tuple[float, float], Tuple[float, float, float]]):
-        self.__center = val
+        ))
 
     @property
     def edge_cut(self) -> float:
@@ -85,8 +134,6 @@ class Plate(GrowthCurve, Identified, IdentifiedCollection, Named, Circle):
 
         :returns: a dictionary of measurements at time intervals
         """
-        from .utilities import dicts_merge
-
         return dicts_merge([colony.growth_curve.data for colony in self.items])
 
     def colonies_to_csv(self, save_path: Path, headers: List[str] = None) -> Path:
@@ -98,28 +145,7 @@ class Plate(GrowthCurve, Identified, IdentifiedCollection, Named, Circle):
         :returns: a Path representing the new file, if successful
         """
         if headers is None:
-            headers = [
-                "Colony ID",
-                "Time of appearance (elapsed time)",
-                "Time of appearance (elapsed minutes)",
-                "Center point averaged (row, column)",
-                "Colour averaged name",
-                "Colour averaged (R,G,B)",
-                "Lag time (minutes)",
-                "Lag time standard deviation (minutes)",
-                "Growth rate (log2[Area] / minute)",
-                "Growth rate standard deviation (log2[Area] / minute)",
-                "Carrying capacity (log2[Area])",
-                "Carrying capacity standard deviation (log2[Area])",
-                "Doubling time (minutes)",
-                "Doubling time standard deviation(minutes)",
-                "First detection (elapsed minutes)",
-                "First area (pixels)",
-                "First diameter (pixels)",
-                "Final detection (elapsed minutes)",
-                "Final area (pixels)",
-                "Final diameter (pixels)"
-            ]
+            headers = _COLONY_CSV_HEADERS
 
         return self.__collection_to_csv(
             save_path,
@@ -137,21 +163,14 @@ class Plate(GrowthCurve, Identified, IdentifiedCollection, Named, Circle):
         :returns: a Path representing the new file, if successful
         """
         if headers is None:
-            headers = [
-                "Colony ID",
-                "Elapsed time (minutes)",
-                "Area (pixels)",
-                "Center (row, column)",
-                "Diameter (pixels)",
-                "Perimeter (pixels)",
-                "Color average (R,G,B)"
-            ]
-
-        # Unpack timepoint properties to a flat list
-        colony_timepoints = list()
-        for colony in self.items:
-            for timepoint in colony.timepoints:
-                colony_timepoints.append([colony.id, *timepoint])
+            headers = _TIMEPOINT_CSV_HEADERS
+
+        # Unpack timepoint properties to a flat list of rows, built in a single pass
+        colony_timepoints = [
+            (colony.id, *timepoint)
+            for colony in self.items
+            for timepoint in colony.timepoints
+        ]
 
         return self.__collection_to_csv(
             save_path,
@@ -167,6 +186,9 @@ class Plate(GrowthCurve, Identified, IdentifiedCollection, Named, Circle):
         :param start: the new initial ID number
         :returns: the final ID number of the renamed sequence
         """
+        # Return the number before start if there are no colonies to rename
+        i = start - 1
+
         for i, colony in enumerate(self.items, start = start):
             colony.id = i
 
@@ -183,23 +205,33 @@ class Plate(GrowthCurve, Identified, IdentifiedCollection, Named, Circle):
         :param headers: a list of strings to use as column headers
         :returns: a Path representing the new file, if successful
         """
-        # Check that a path has been specified and can be found
+        # Check that a path has been specified
         if not isinstance(save_path, Path):
             save_path = Path(save_path)
-        if not save_path.exists() or str(PurePath(save_path)) == ".":
+        if str(PurePath(save_path)) == ".":
             raise FileNotFoundError(f"The path '{str(save_path)}' could not be found. Please specify a different save path")
 
-        return save_to_csv(
-            data,
-            headers,
-            save_path.joinpath(file_name)
-        )
+        try:
+            return save_to_csv(
+                data,
+                headers,
+                save_path.joinpath(file_name)
+            )
+        except IOError:
+            # Only check that the path exists if saving fails, avoiding a filesystem lookup for every file
+            if not save_path.exists():
+                raise FileNotFoundError(
+                    f"The path '{str(save_path)}' could not be found. Please specify a different save path"
+                )
+            raise
 
 
 class PlateCollection(IdentifiedCollection):
     """
     Holds a collection of Plates
     """
+    __slots__ = ("__shape",)
+
     def __init__(self, plates: Collection = None, shape: Tuple[int, int] = None):
         super(PlateCollection, self).__init__(plates)
         if shape is None:
@@ -209,7 +241,7 @@ class PlateCollection(IdentifiedCollection):
 
     @property
     def centers(self) -> Union[List[Tuple[float, float]], List[Tuple[float, float, float]]]:
-        return [plate.center for plate in self.items]
+        return list(map(attrgetter("center"), self.items))
 
     @property
     def shape(self) -> Tuple[int, int]:
@@ -285,8 +317,6 @@ class PlateCollection(IdentifiedCollection):
         :param labels: a dict of labels for each plate, with the plate ID as a key
         :returns: a list of Plate instances
         """
-        from .imaging import get_image_circles
-
         if not self.shape:
             raise ValueError("The PlateCollection shape property is required, but has not been set")
 
@@ -323,23 +353,7 @@ class PlateCollection(IdentifiedCollection):
         :returns: a Path representing the new file, if successful
         """
         if headers is None:
-            headers = [
-                "Plate ID",
-                "Plate label",
-                "Center (row, column)",
-                "Diameter (pixels)",
-                "Edge cut (pixels)",
-                "Colony count",
-                "Time of appearance (minutes)",
-                "Lag time (minutes)",
-                "Lag time standard deviation (minutes)",
-                "Growth rate (log2[Area] / minute)",
-                "Growth rate standard deviation (log2[Area] / minute)",
-                "Carrying capacity (log2[Area])",
-                "Carrying capacity standard deviation (log2[Area])",
-                "Doubling time (minutes)",
-                "Doubling time standard deviation (minutes)"
-            ]
+            headers = _PLATE_CSV_HEADERS
 
         return Plate._Plate__collection_to_csv(
             save_path,
@@ -348,25 +362,37 @@ class PlateCollection(IdentifiedCollection):
             headers
         )
 
-    def slice_plate_image(self, image: ndarray, background_color: Tuple = 0) -> Dict[int, ndarray]:
+    def slice_plate_image(
+        self,
+        image: ndarray,
+        background_color: Tuple = 0,
+        dtype: type = None
+    ) -> Dict[int, ndarray]:
         """
         Split an image into individual plate subimages and delete background
 
         Slices according to the Plate instances in the current collection
 
         :param image: an image as a numpy array
+        :param background_color: the color to replace the area outside each plate
+        :param dtype: an optional data type to convert the plate images to, defaults to the image data type
         :returns: a doct of plate images with the plate ID number as the key
         """
-        from .imaging import cut_image_circle
         images = dict()
 
+        # Each plate is a copy of its bounding box with a circular mask applied, which is limited
+        # by memory bandwidth. Plate masks are kept in their own cache, so they are only built for
+        # the first image. Images are already sliced in parallel in separate processes
         for plate in self.items:
             images[plate.id] = cut_image_circle(
                 image,
                 center = plate.center,
                 radius = plate.radius - plate.edge_cut,
-                background_color = background_color
+                background_color = background_color,
+                cache_mask = True
             )
+            if dtype is not None:
+                images[plate.id] = images[plate.id].astype(dtype, copy = False)
 
         return images
 
@@ -380,14 +406,12 @@ class PlateCollection(IdentifiedCollection):
         :param coordinate: a row, column coordinate tuple
         :returns: a positional index number
         """
-        from numpy import prod
-
         if not PlateCollection.__is_valid_shape(coordinate):
             raise ValueError(
                 f"The supplied coordinates, {coordinate}, are not valid. All values must be non-negative integers"
             )
 
-        return prod(coordinate)
+        return reduce(mul, coordinate, 1)
 
     @staticmethod
     def index_to_coordinate(index: int, shape: Tuple[int, int]) -> Tuple[int, int]:
@@ -405,8 +429,9 @@ class PlateCollection(IdentifiedCollection):
 
         shape_row, shape_col = shape
 
-        row = ((index - 1) // shape_col) + 1
-        col = ((index - 1) % shape_col) + 1
+        row, col = divmod(index - 1, shape_col)
+        row += 1
+        col += 1
 
         if row > shape_row or col > shape_col:
             raise IndexError("Index number is greater than the supplied shape size")
@@ -415,7 +440,4 @@ class PlateCollection(IdentifiedCollection):
 
     @staticmethod
     def __is_valid_shape(shape: Tuple[int, int]) -> bool:
-        return (
-            all(shape) and
-            not any([(not isinstance(val, int) or val < 1) for val in shape])
-        )
\ No newline at end of file
+        return all(isinstance(val, int) and val > 0 for val in shape)
\ No newline at end of file
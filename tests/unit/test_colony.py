@@ -158,6 +158,15 @@ class TestColony():
                 if not field.type == timedelta:
                     assert isinstance(value, field.type)
 
+        def test_pickle(self, timepoints):
+            import pickle
+
+            timepoint = pickle.loads(pickle.dumps(timepoints[0], pickle.HIGHEST_PROTOCOL))
+
+            assert timepoint == timepoints[0]
+            assert timepoint.center == timepoints[0].center
+            assert not hasattr(timepoint, "__dict__")
+
     class TestMethods():
         def test_get_timepoint(self, timepoints):
             colony = Colony(1, timepoints)
@@ -170,9 +179,16 @@ class TestColony():
             colony.append_timepoint(timepoint_empty)
 
             assert timepoint_empty in colony.timepoints
+            assert colony.timepoint_first == timepoint_empty
             with pytest.raises(ValueError):
                 colony.append_timepoint(timepoints[0])
 
+        def test_append_timepoint_empty(self, timepoint_empty):
+            colony = Colony(1)
+            colony.append_timepoint(timepoint_empty)
+
+            assert colony.timepoints == [timepoint_empty]
+
         def test_remove_timepoint(self, timepoints):
             colony = Colony(1, timepoints)
             colony.remove_timepoint(timepoints[0].timestamp)
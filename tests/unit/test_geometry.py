@@ -76,6 +76,13 @@ class TestCircle():
 
         assert circle.area == pi * radius * radius
 
+    def test_area_diameter_changed(self, diameter):
+        circle = Circle(1)
+        circle.diameter = diameter
+        radius = diameter / 2
+
+        assert circle.area == pi * radius * radius
+
     def test_circumference(self, diameter):
         circle = Circle(diameter)
 
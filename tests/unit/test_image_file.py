@@ -80,6 +80,15 @@ class TestImageFile:
             else:
                 assert imagefile._ImageFile__image is None
 
+        def test_enter_image_loaded(self, tmp_path, timestamp_image, cache_image, image):
+            image_path = TestImageFile.create_temp_file(tmp_path, timestamp_image[1], suffix = "png", file_data = image)
+            imagefile = ImageFile(image_path, cache_image = cache_image)
+
+            with imagefile as image_file:
+                with mock.patch.object(ImageFile, "_ImageFile__load_image") as load_image:
+                    assert (image_file.image == array([[[255, 255, 255, 255]]])).all()
+                    load_image.assert_not_called()
+
     class TestProperties:
         @pytest.mark.parametrize("image_path", ["", Path(), "."])
         def test_filepath_missing(self, image_path):
@@ -222,4 +231,15 @@ class TestImageFileCollection:
             assert imagefiles.count == len(image_files) + 1
             assert new_image_file in imagefiles.items
             assert image_file_first != new_image_file
-            assert imagefiles.items[0] == new_image_file
\ No newline at end of file
+            assert imagefiles.items[0] == new_image_file
+
+        def test_append_image_file_sorted(self, image_files):
+            imagefiles = ImageFileCollection(image_files[2:5] + image_files[6:])
+
+            # Append older image files to a populated collection
+            imagefiles.append(image_files[5])
+            imagefiles.append(image_files[0])
+            imagefiles.append(image_files[1])
+
+            assert imagefiles.count == len(image_files)
+            assert imagefiles.items == image_files
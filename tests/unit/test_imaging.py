@@ -76,6 +76,11 @@ class TestCropImage():
         if crop_shape == (2, 4) and center == (6, 3):
             assert (result == image_ref).all()
 
+    def test_crop_copy(self, image, crop_shape):
+        result = crop_image(image, crop_shape)
+
+        assert not np.shares_memory(result, image)
+
     def test_shape_invalid(self, image, crop_shape_invalid):
         with pytest.raises(ValueError):
 
@@ -162,6 +167,14 @@ class TestCutImageCircle():
         assert result.shape == image_ref.shape
         assert (result == image_ref).all()
 
+    def test_image_unchanged(self, image, boolean):
+        image_ref = image.copy()
+
+        cut_image_circle(image, inverse = boolean)
+        cut_image_circle(image, center = (2, 4), radius = 1, inverse = boolean)
+
+        assert (image == image_ref).all()
+
     def test_exceed_shape(self, image):
         with pytest.raises(ValueError):
             image_radius = image.shape[0] // 2
@@ -111,6 +111,11 @@ class TestPlate():
             for i in range(seq_start, seq_start + len(colonies)):
                 assert any(colony.id == i for colony in plate.items)
 
+        def test_colonies_rename_sequential_empty(self, plate):
+            seq_start = 11
+
+            assert plate.colonies_rename_sequential(start = seq_start) == seq_start - 1
+
         def test_colonies_to_csv(self, plate, colonies, tmp_path):
             import csv
 
@@ -149,6 +154,10 @@ class TestPlate():
             with pytest.raises(FileNotFoundError):
                 plate._Plate__collection_to_csv("", "", list())
 
+        def test_collection_to_csv_path_missing(self, plate, tmp_path):
+            with pytest.raises(FileNotFoundError):
+                plate._Plate__collection_to_csv(tmp_path.joinpath("missing"), "test", list())
+
 
 class TestPlateCollection:
     class TestInitialize:
@@ -157,6 +166,7 @@ class TestPlateCollection:
             collection = PlateCollection(shape = shape)
 
             assert collection.shape == shape
+            assert not hasattr(collection, "__dict__")
 
         @pytest.mark.parametrize("shape", [(0, 1), (-1, 1), (1.1, 1)])
         def test_init_invalid(self, shape):
@@ -258,6 +268,42 @@ class TestPlateCollection:
 
             assert len(images) == 1
             assert images[1].shape == (141, 141)
+            assert images[1].dtype == image_circle.dtype
+
+        def test_slice_plate_image_mask_cached(self, image_circle):
+            from colonyscanalyser.imaging import _circle_mask_cached, cut_image_circle
+
+            plates = PlateCollection(shape = (1, 2))
+            plates.add(id = 1, diameter = 180, edge_cut = 20, center = (102, 102))
+            plates.add(id = 2, diameter = 170, edge_cut = 20, center = (102, 102))
+
+            _circle_mask_cached.cache_clear()
+            plates.slice_plate_image(image_circle)
+            # Per-object cuts with varying sizes should not evict the plate masks
+            for radius in range(1, 200):
+                cut_image_circle(image_circle, center = (102, 102), radius = radius / 2.5)
+            plates.slice_plate_image(image_circle)
+
+            cache_info = _circle_mask_cached.cache_info()
+            assert cache_info.misses == plates.count
+            assert cache_info.hits == plates.count
+
+        def test_slice_plate_image_dtype(self, image_circle):
+            from numpy import float32
+
+            plates = PlateCollection(shape = (1, 1))
+            plates.add(
+                id = 1,
+                diameter = 180,
+                edge_cut = 20,
+                center = (102, 102)
+            )
+
+            images = plates.slice_plate_image(image_circle.astype("float64"), dtype = float32)
+
+            assert images[1].shape == (141, 141)
+            assert images[1].dtype == float32
+            assert (images[1] == plates.slice_plate_image(image_circle)[1]).all()
 
         @pytest.mark.parametrize(
             "index, shape, expected",
@@ -293,11 +339,13 @@ class TestPlateCollection:
                 ((3, 2), 6),
                 ((1, 8), 8),
                 ((5, 5), 25),
+                ((), 1),
             ])
         def test_coordinate_to_index(self, coordinate, expected):
             result = PlateCollection.coordinate_to_index(coordinate)
 
             assert result == expected
+            assert isinstance(result, int)
 
         @pytest.mark.parametrize("coordinate", [(0, 0), (-1, 1)])
         def test_coordinate_to_index_invalid(self, coordinate):